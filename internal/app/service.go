@@ -5,8 +5,9 @@ import (
 	"errors"
 	"fmt"
 	"log"
-	"os"
+	"sort"
 	"strings"
+	"sync"
 	"time"
 
 	"github.com/robfig/cron/v3"
@@ -14,42 +15,67 @@ import (
 	"github.com/rcarmo/syncthing-kicker/internal/syncthing"
 )
 
+// Per-call timeouts for Syncthing API requests (vars so tests can shorten them).
+var (
+	scanTimeout   = 5 * time.Second
+	statusTimeout = 10 * time.Second
+	configTimeout = 15 * time.Second
+)
+
+// folderListTTL bounds how long the wildcard folder list is reused before
+// /rest/system/config is fetched again.
+const folderListTTL = 60 * time.Second
+
 type Service struct {
 	Settings Settings
 	Client   *syncthing.Client
 	Logger   *log.Logger
+
+	// statusChecks tracks follow-up status checks so Run can wait for them.
+	statusChecks sync.WaitGroup
+
+	// apiSlots bounds in-flight API calls to the client's pool size; a slot is
+	// taken before a call's timeout starts so queued calls do not expire.
+	apiSlotsOnce sync.Once
+	apiSlots     chan struct{}
+
+	folderMu      sync.Mutex
+	folderIDs     []string
+	folderFetched time.Time
 }
 
 func (s *Service) CheckOnce(ctx context.Context) error {
-	folders := foldersFromEnv()
-	return s.checkSyncStatus(ctx, folders, 0)
+	return s.checkSyncStatus(ctx, s.Settings.Folders, 0)
 }
 
 func (s *Service) Run(ctx context.Context) error {
-	pending := make(chan struct{}, 1024)
-	defer close(pending)
+	defer s.statusChecks.Wait()
 
 	if s.Settings.ScanOnStartup {
 		s.Logger.Printf("Triggering scan on startup")
-		folders := foldersFromEnv()
-		if err := s.triggerScans(ctx, folders, pending); err != nil {
-			return err
-		}
+		// One triggerScans call, so startup scans run concurrently too.
+		folderCron := make([]string, 0, len(s.Settings.FolderCron))
 		for folder := range s.Settings.FolderCron {
-			if err := s.triggerScans(ctx, []string{folder}, pending); err != nil {
-				return err
-			}
+			folderCron = append(folderCron, folder)
+		}
+		sort.Strings(folderCron)
+		folders := append(append([]string{}, s.Settings.Folders...), folderCron...)
+		if err := s.triggerScans(ctx, folders); err != nil {
+			return err
 		}
 		if s.Settings.RunOnce {
 			return nil
 		}
 	}
 
-	sched, err := s.buildCronScheduler(pending)
+	sched, err := s.buildCronScheduler(ctx)
 	if err != nil {
 		return err
 	}
-	defer sched.Stop()
+	defer func() {
+		// Wait for running jobs; they share ctx, so they wind down promptly.
+		<-sched.Stop().Done()
+	}()
 
 	s.Logger.Printf("Scheduler starting")
 	sched.Start()
@@ -58,7 +84,7 @@ func (s *Service) Run(ctx context.Context) error {
 	return ctx.Err()
 }
 
-func (s *Service) buildCronScheduler(pending chan struct{}) (*cron.Cron, error) {
+func (s *Service) buildCronScheduler(ctx context.Context) (*cron.Cron, error) {
 	opts := []cron.Option{}
 	if tz := strings.TrimSpace(s.Settings.CronTimezone); tz != "" {
 		loc, err := time.LoadLocation(tz)
@@ -71,27 +97,56 @@ func (s *Service) buildCronScheduler(pending chan struct{}) (*cron.Cron, error)
 
 	// 5-field cron (min hour dom mon dow)
 	parser := cron.NewParser(cron.Minute | cron.Hour | cron.Dom | cron.Month | cron.Dow)
-	c := cron.New(append(opts, cron.WithParser(parser))...)
+	c := cron.New(opts...)
+
+	// Parse each distinct expression once; folders that share a schedule
+	// (or match ST_CRON) reuse the same compiled cron.Schedule.
+	parsed := map[string]cron.Schedule{}
+	parse := func(expr string) (cron.Schedule, error) {
+		if sched, ok := parsed[expr]; ok {
+			return sched, nil
+		}
+		sched, err := parser.Parse(expr)
+		if err != nil {
+			return nil, err
+		}
+		parsed[expr] = sched
+		return sched, nil
+	}
 
 	if s.Settings.CronExpr != "" {
-		folders := foldersFromEnv()
-		if _, err := c.AddFunc(s.Settings.CronExpr, func() {
-			ctx := context.Background()
-			_ = s.triggerScans(ctx, folders, pending)
-		}); err != nil {
+		folders := s.Settings.Folders
+		sched, err := parse(s.Settings.CronExpr)
+		if err != nil {
 			return nil, fmt.Errorf("invalid ST_CRON: %w", err)
 		}
+		c.Schedule(sched, cron.FuncJob(func() {
+			_ = s.triggerScans(ctx, folders)
+		}))
 	}
 
+	// Coalesce folders that share an expression into a single entry; the cron
+	// run loop re-sorts its entries on every wake-up, so keep that list short.
+	byExpr := map[string][]string{}
 	for folder, expr := range s.Settings.FolderCron {
-		folder := folder
-		expr := expr
-		if _, err := c.AddFunc(expr, func() {
-			ctx := context.Background()
-			_ = s.triggerScans(ctx, []string{folder}, pending)
-		}); err != nil {
-			return nil, fmt.Errorf("invalid ST_FOLDER_CRON expr for %s: %w", folder, err)
+		byExpr[expr] = append(byExpr[expr], folder)
+	}
+	exprs := make([]string, 0, len(byExpr))
+	for expr := range byExpr {
+		exprs = append(exprs, expr)
+	}
+	sort.Strings(exprs)
+
+	for _, expr := range exprs {
+		folders := byExpr[expr]
+		sort.Strings(folders)
+		sched, err := parse(expr)
+		if err != nil {
+			return nil, fmt.Errorf("invalid ST_FOLDER_CRON expr for %s: %w", strings.Join(folders, ", "), err)
 		}
+		c.Schedule(sched, cron.FuncJob(func() {
+			_ = s.triggerScans(ctx, folders)
+		}))
 	}
 
 	if len(c.Entries()) == 0 {
@@ -100,45 +155,83 @@ func (s *Service) buildCronScheduler(pending chan struct{}) (*cron.Cron, error)
 	return c, nil
 }
 
-func (s *Service) triggerScans(ctx context.Context, folders []string, pending chan struct{}) error {
+func (s *Service) triggerScans(ctx context.Context, folders []string) error {
+	targets := make([]string, 0, len(folders))
 	for _, folder := range folders {
 		folder = strings.TrimSpace(folder)
-		if folder == "" {
-			continue
+		if folder != "" {
+			targets = append(targets, folder)
 		}
+	}
 
-		if s.Settings.DryRun {
-			s.Logger.Printf("[dry-run] Would trigger scan for folder '%s'", folder)
-		} else {
-			// Syncthing may hold POST open; keep timeout low and treat timeouts as success.
-			_, err := s.Client.PostScan(ctx, folder, 5*time.Second)
-			if err != nil {
-				// If the context timed out, treat it as non-fatal.
-				if errors.Is(err, context.DeadlineExceeded) {
-					s.Logger.Printf("Scan trigger for folder '%s' timed out; Syncthing may still be processing", folder)
-				} else {
-					s.Logger.Printf("Scan trigger failed for folder '%s': %v", folder, err)
-				}
-			} else {
-				s.Logger.Printf("Triggered scan for folder '%s'", folder)
-			}
-		}
+	// Trigger scans concurrently, at most syncthing.MaxConnsPerHost at a time.
+	var wg sync.WaitGroup
+	for _, folder := range targets {
+		wg.Add(1)
+		go func(folder string) {
+			defer wg.Done()
+			s.triggerScan(ctx, folder)
+		}(folder)
+	}
+	wg.Wait()
 
-		// Fire-and-forget status check.
-		select {
-		case pending <- struct{}{}:
-		default:
-		}
+	// Nothing was scanned, so there is nothing to follow up on.
+	if s.Settings.DryRun && len(targets) > 0 {
+		s.Logger.Printf("[dry-run] Would check status for folder(s) %s", strings.Join(targets, ", "))
+		return nil
+	}
+
+	for _, folder := range targets {
+		// Status checks run in the background; Run waits for them on exit.
+		s.statusChecks.Add(1)
 		go func(folder string) {
-			defer func() {
-				<-pending
-			}()
-			_ = s.checkSyncStatus(context.Background(), []string{folder}, s.Settings.StatusDelaySec)
+			defer s.statusChecks.Done()
+			_ = s.checkSyncStatus(ctx, []string{folder}, s.Settings.StatusDelaySec)
 		}(folder)
 	}
 	return nil
 }
 
+func (s *Service) triggerScan(ctx context.Context, folder string) {
+	if s.Settings.DryRun {
+		s.Logger.Printf("[dry-run] Would trigger scan for folder '%s'", folder)
+		return
+	}
+
+	release, err := s.acquireAPISlot(ctx)
+	if err != nil {
+		s.Logger.Printf("Scan trigger for folder '%s' cancelled: %v", folder, err)
+		return
+	}
+	defer release()
+
+	// Syncthing may hold POST open; keep timeout low and treat timeouts as success.
+	_, err = s.Client.PostScan(ctx, folder, scanTimeout)
+	if err != nil {
+		// If the context timed out, treat it as non-fatal.
+		if errors.Is(err, context.DeadlineExceeded) {
+			s.Logger.Printf("Scan trigger for folder '%s' timed out; Syncthing may still be processing", folder)
+		} else {
+			s.Logger.Printf("Scan trigger failed for folder '%s': %v", folder, err)
+		}
+		return
+	}
+	s.Logger.Printf("Triggered scan for folder '%s'", folder)
+}
+
+// acquireAPISlot blocks until an API slot is free or ctx is done.
+func (s *Service) acquireAPISlot(ctx context.Context) (func(), error) {
+	s.apiSlotsOnce.Do(func() {
+		s.apiSlots = make(chan struct{}, syncthing.MaxConnsPerHost)
+	})
+	select {
+	case s.apiSlots <- struct{}{}:
+		return func() { <-s.apiSlots }, nil
+	case <-ctx.Done():
+		return nil, ctx.Err()
+	}
+}
+
 func (s *Service) checkSyncStatus(ctx context.Context, folders []string, delaySec float64) error {
 	if delaySec > 0 {
 		t := time.NewTimer(time.Duration(delaySec * float64(time.Second)))
@@ -160,16 +253,12 @@ func (s *Service) checkSyncStatus(ctx context.Context, folders []string, delaySe
 
 	folderIDs := []string{}
 	if wantAll {
-		cfg, _, err := s.Client.SystemConfig(ctx, 15*time.Second)
+		ids, err := s.listFolderIDs(ctx)
 		if err != nil {
 			s.Logger.Printf("Failed to fetch folder list for wildcard status check: %v", err)
 			return nil
 		}
-		for _, f := range cfg.Folders {
-			if strings.TrimSpace(f.ID) != "" {
-				folderIDs = append(folderIDs, f.ID)
-			}
-		}
+		folderIDs = ids
 		if len(folderIDs) == 0 {
 			s.Logger.Printf("No folders returned by Syncthing config; nothing to report")
 			return nil
@@ -183,32 +272,61 @@ func (s *Service) checkSyncStatus(ctx context.Context, folders []string, delaySe
 		}
 	}
 
+	var wg sync.WaitGroup
 	for _, id := range folderIDs {
-		st, _, err := s.Client.FolderStatus(ctx, id, 10*time.Second)
-		if err != nil {
-			s.Logger.Printf("Folder %s status check failed: %v", id, err)
-			continue
-		}
-		s.Logger.Printf("Folder %s status: state=%s needBytes=%d inSyncBytes=%d", id, st.State, st.NeedBytes, st.InSyncBytes)
+		wg.Add(1)
+		go func(id string) {
+			defer wg.Done()
+			s.logFolderStatus(ctx, id)
+		}(id)
 	}
+	wg.Wait()
 	return nil
 }
 
-func foldersFromEnv() []string {
-	raw := os.Getenv("ST_FOLDERS")
-	if strings.TrimSpace(raw) == "" {
-		return []string{"*"}
+// listFolderIDs returns the folder IDs from Syncthing's config, reusing the
+// last result for folderListTTL. Failed fetches clear the cache.
+func (s *Service) listFolderIDs(ctx context.Context) ([]string, error) {
+	s.folderMu.Lock()
+	defer s.folderMu.Unlock()
+
+	if s.folderIDs != nil && time.Since(s.folderFetched) < folderListTTL {
+		return s.folderIDs, nil
 	}
-	parts := strings.Split(raw, ",")
-	out := make([]string, 0, len(parts))
-	for _, p := range parts {
-		p = strings.TrimSpace(p)
-		if p != "" {
-			out = append(out, p)
+
+	release, err := s.acquireAPISlot(ctx)
+	if err != nil {
+		return nil, err
+	}
+	cfg, _, err := s.Client.SystemConfig(ctx, configTimeout)
+	release()
+	if err != nil {
+		s.folderIDs = nil
+		return nil, err
+	}
+	ids := make([]string, 0, len(cfg.Folders))
+	for _, f := range cfg.Folders {
+		if strings.TrimSpace(f.ID) != "" {
+			ids = append(ids, f.ID)
 		}
 	}
-	if len(out) == 0 {
-		return []string{"*"}
+	s.folderIDs = ids
+	s.folderFetched = time.Now()
+	return ids, nil
+}
+
+func (s *Service) logFolderStatus(ctx context.Context, id string) {
+	release, err := s.acquireAPISlot(ctx)
+	if err != nil {
+		s.Logger.Printf("Folder %s status check cancelled: %v", id, err)
+		return
+	}
+	defer release()
+
+	st, _, err := s.Client.FolderStatus(ctx, id, statusTimeout)
+	if err != nil {
+		s.Logger.Printf("Folder %s status check failed: %v", id, err)
+		return
 	}
-	return out
+	s.Logger.Printf("Folder %s status: state=%s needBytes=%d inSyncBytes=%d", id, st.State, st.NeedBytes, st.InSyncBytes)
 }
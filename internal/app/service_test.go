@@ -1,9 +1,16 @@
 package app
 
 import (
+	"context"
+	"fmt"
 	"io"
 	"log"
+	"net/http"
+	"net/http/httptest"
+	"sync"
+	"sync/atomic"
 	"testing"
+	"time"
 
 	"github.com/rcarmo/syncthing-kicker/internal/syncthing"
 )
@@ -19,7 +26,7 @@ func TestBuildCronSchedulerRejectsInvalidGlobalCron(t *testing.T) {
 		Logger: log.New(io.Discard, "", 0),
 	}
 
-	_, err := svc.buildCronScheduler(make(chan struct{}, 1))
+	_, err := svc.buildCronScheduler(context.Background())
 	if err == nil {
 		t.Fatalf("expected error")
 	}
@@ -36,7 +43,7 @@ func TestBuildCronSchedulerRejectsInvalidFolderCronExpr(t *testing.T) {
 		Logger: log.New(io.Discard, "", 0),
 	}
 
-	_, err := svc.buildCronScheduler(make(chan struct{}, 1))
+	_, err := svc.buildCronScheduler(context.Background())
 	if err == nil {
 		t.Fatalf("expected error")
 	}
@@ -53,7 +60,7 @@ func TestBuildCronSchedulerRejectsInvalidTimezone(t *testing.T) {
 		Logger: log.New(io.Discard, "", 0),
 	}
 
-	_, err := svc.buildCronScheduler(make(chan struct{}, 1))
+	_, err := svc.buildCronScheduler(context.Background())
 	if err == nil {
 		t.Fatalf("expected error")
 	}
@@ -71,7 +78,7 @@ func TestBuildCronSchedulerRejectsCronWithTooFewFields(t *testing.T) {
 		Logger: log.New(io.Discard, "", 0),
 	}
 
-	_, err := svc.buildCronScheduler(make(chan struct{}, 1))
+	_, err := svc.buildCronScheduler(context.Background())
 	if err == nil {
 		t.Fatalf("expected error for cron with too few fields")
 	}
@@ -89,7 +96,7 @@ func TestBuildCronSchedulerRejectsCronWithTooManyFields(t *testing.T) {
 		Logger: log.New(io.Discard, "", 0),
 	}
 
-	_, err := svc.buildCronScheduler(make(chan struct{}, 1))
+	_, err := svc.buildCronScheduler(context.Background())
 	if err == nil {
 		t.Fatalf("expected error for cron with too many fields")
 	}
@@ -107,7 +114,7 @@ func TestBuildCronSchedulerRejectsOutOfRangeMinute(t *testing.T) {
 		Logger: log.New(io.Discard, "", 0),
 	}
 
-	_, err := svc.buildCronScheduler(make(chan struct{}, 1))
+	_, err := svc.buildCronScheduler(context.Background())
 	if err == nil {
 		t.Fatalf("expected error for minute value out of range")
 	}
@@ -124,7 +131,7 @@ func TestBuildCronSchedulerRejectsOutOfRangeHour(t *testing.T) {
 		Logger: log.New(io.Discard, "", 0),
 	}
 
-	_, err := svc.buildCronScheduler(make(chan struct{}, 1))
+	_, err := svc.buildCronScheduler(context.Background())
 	if err == nil {
 		t.Fatalf("expected error for hour value out of range")
 	}
@@ -141,7 +148,7 @@ func TestBuildCronSchedulerRejectsOutOfRangeDayOfMonth(t *testing.T) {
 		Logger: log.New(io.Discard, "", 0),
 	}
 
-	_, err := svc.buildCronScheduler(make(chan struct{}, 1))
+	_, err := svc.buildCronScheduler(context.Background())
 	if err == nil {
 		t.Fatalf("expected error for day of month value out of range")
 	}
@@ -158,7 +165,7 @@ func TestBuildCronSchedulerRejectsOutOfRangeMonth(t *testing.T) {
 		Logger: log.New(io.Discard, "", 0),
 	}
 
-	_, err := svc.buildCronScheduler(make(chan struct{}, 1))
+	_, err := svc.buildCronScheduler(context.Background())
 	if err == nil {
 		t.Fatalf("expected error for month value out of range")
 	}
@@ -175,7 +182,7 @@ func TestBuildCronSchedulerRejectsOutOfRangeDayOfWeek(t *testing.T) {
 		Logger: log.New(io.Discard, "", 0),
 	}
 
-	_, err := svc.buildCronScheduler(make(chan struct{}, 1))
+	_, err := svc.buildCronScheduler(context.Background())
 	if err == nil {
 		t.Fatalf("expected error for day of week value out of range")
 	}
@@ -193,7 +200,7 @@ func TestBuildCronSchedulerRejectsEmptyCronExpression(t *testing.T) {
 		Logger: log.New(io.Discard, "", 0),
 	}
 
-	_, err := svc.buildCronScheduler(make(chan struct{}, 1))
+	_, err := svc.buildCronScheduler(context.Background())
 	if err == nil {
 		t.Fatalf("expected error for no schedules configured")
 	}
@@ -211,7 +218,7 @@ func TestBuildCronSchedulerRejectsInvalidSpecialCharacters(t *testing.T) {
 		Logger: log.New(io.Discard, "", 0),
 	}
 
-	_, err := svc.buildCronScheduler(make(chan struct{}, 1))
+	_, err := svc.buildCronScheduler(context.Background())
 	if err == nil {
 		t.Fatalf("expected error for invalid special character")
 	}
@@ -229,7 +236,7 @@ func TestBuildCronSchedulerRejectsInvalidStepValue(t *testing.T) {
 		Logger: log.New(io.Discard, "", 0),
 	}
 
-	_, err := svc.buildCronScheduler(make(chan struct{}, 1))
+	_, err := svc.buildCronScheduler(context.Background())
 	if err == nil {
 		t.Fatalf("expected error for invalid step value")
 	}
@@ -247,7 +254,7 @@ func TestBuildCronSchedulerRejectsInvalidRange(t *testing.T) {
 		Logger: log.New(io.Discard, "", 0),
 	}
 
-	_, err := svc.buildCronScheduler(make(chan struct{}, 1))
+	_, err := svc.buildCronScheduler(context.Background())
 	if err == nil {
 		t.Fatalf("expected error for invalid range")
 	}
@@ -276,7 +283,7 @@ func TestBuildCronSchedulerAcceptsValidComplexExpressions(t *testing.T) {
 			Logger: log.New(io.Discard, "", 0),
 		}
 
-		_, err := svc.buildCronScheduler(make(chan struct{}, 1))
+		_, err := svc.buildCronScheduler(context.Background())
 		if err != nil {
 			t.Fatalf("expected valid cron expression %q to be accepted, got error: %v", expr, err)
 		}
@@ -296,7 +303,7 @@ func TestBuildCronSchedulerRejectsExtraWhitespace(t *testing.T) {
 	}
 
 	// This should actually be accepted by the cron parser (it handles whitespace)
-	_, err := svc.buildCronScheduler(make(chan struct{}, 1))
+	_, err := svc.buildCronScheduler(context.Background())
 	if err != nil {
 		// If error, that's fine - whitespace handling varies
 		return
@@ -323,7 +330,7 @@ func TestBuildCronSchedulerAcceptsValidTimezones(t *testing.T) {
 			Logger: log.New(io.Discard, "", 0),
 		}
 
-		_, err := svc.buildCronScheduler(make(chan struct{}, 1))
+		_, err := svc.buildCronScheduler(context.Background())
 		if err != nil {
 			t.Fatalf("expected valid timezone %q to be accepted, got error: %v", tz, err)
 		}
@@ -346,12 +353,215 @@ func TestBuildCronSchedulerRejectsMultipleFoldersWithOneInvalid(t *testing.T) {
 		Logger: log.New(io.Discard, "", 0),
 	}
 
-	_, err := svc.buildCronScheduler(make(chan struct{}, 1))
+	_, err := svc.buildCronScheduler(context.Background())
 	if err == nil {
 		t.Fatalf("expected error when one folder has invalid cron")
 	}
 }
 
+// Test folders sharing an expression are registered as a single entry
+func TestBuildCronSchedulerCoalescesFoldersWithSameExpr(t *testing.T) {
+	svc := &Service{
+		Settings: Settings{
+			CronExpr: "",
+			FolderCron: map[string]string{
+				"folderA": "*/5 * * * *",
+				"folderB": "*/5 * * * *",
+				"folderC": "0 0 * * *",
+			},
+			CronTimezone: "",
+		},
+		Client: syncthingStub(),
+		Logger: log.New(io.Discard, "", 0),
+	}
+
+	c, err := svc.buildCronScheduler(context.Background())
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	if got := len(c.Entries()); got != 2 {
+		t.Fatalf("expected 2 entries, got %d", got)
+	}
+}
+
+// Test wildcard status checks reuse the cached folder list
+func TestCheckSyncStatusCachesWildcardFolderList(t *testing.T) {
+	var configHits, statusHits atomic.Int32
+	srv := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		switch r.URL.Path {
+		case "/rest/system/config":
+			configHits.Add(1)
+			_, _ = w.Write([]byte(`{"folders":[{"id":"folderA"},{"id":"folderB"}]}`))
+		case "/rest/db/status":
+			statusHits.Add(1)
+			_, _ = w.Write([]byte(`{"state":"idle"}`))
+		default:
+			http.NotFound(w, r)
+		}
+	}))
+	defer srv.Close()
+
+	client, err := syncthing.NewClient(srv.URL, "abc123", syncthing.ClientOptions{VerifyTLS: true})
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	svc := &Service{
+		Settings: Settings{},
+		Client:   client,
+		Logger:   log.New(io.Discard, "", 0),
+	}
+
+	for i := 0; i < 2; i++ {
+		if err := svc.checkSyncStatus(context.Background(), []string{"*"}, 0); err != nil {
+			t.Fatalf("unexpected error: %v", err)
+		}
+	}
+	if got := configHits.Load(); got != 1 {
+		t.Fatalf("expected 1 config fetch, got %d", got)
+	}
+	if got := statusHits.Load(); got != 4 {
+		t.Fatalf("expected 4 status fetches, got %d", got)
+	}
+}
+
+// Test every scan reaches Syncthing when more folders than pool slots are
+// scheduled and each POST is held open past the scan timeout
+func TestTriggerScansSendsEveryFolderWhenPostsBlock(t *testing.T) {
+	defer func(d time.Duration) { scanTimeout = d }(scanTimeout)
+	scanTimeout = 200 * time.Millisecond
+
+	var mu sync.Mutex
+	scanned := map[string]bool{}
+	srv := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		if r.Method != http.MethodPost {
+			_, _ = w.Write([]byte(`{}`))
+			return
+		}
+		mu.Lock()
+		scanned[r.URL.Query().Get("folder")] = true
+		mu.Unlock()
+		// Like Syncthing, hold the POST until the client gives up.
+		<-r.Context().Done()
+	}))
+	defer srv.Close()
+
+	client, err := syncthing.NewClient(srv.URL, "abc123", syncthing.ClientOptions{VerifyTLS: true})
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	svc := &Service{
+		Settings: Settings{},
+		Client:   client,
+		Logger:   log.New(io.Discard, "", 0),
+	}
+
+	folders := make([]string, 0, 3*syncthing.MaxConnsPerHost/2)
+	for i := 0; i < cap(folders); i++ {
+		folders = append(folders, fmt.Sprintf("folder%d", i))
+	}
+	if err := svc.triggerScans(context.Background(), folders); err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	svc.statusChecks.Wait()
+
+	mu.Lock()
+	defer mu.Unlock()
+	for _, folder := range folders {
+		if !scanned[folder] {
+			t.Fatalf("scan for %s never reached the server (saw %d of %d)", folder, len(scanned), len(folders))
+		}
+	}
+}
+
+// Test every status request reaches Syncthing when more folders than pool
+// slots are checked and each request is held open past the status timeout
+func TestCheckSyncStatusQueriesEveryFolderWhenRequestsBlock(t *testing.T) {
+	defer func(d time.Duration) { statusTimeout = d }(statusTimeout)
+	statusTimeout = 200 * time.Millisecond
+
+	var hits atomic.Int32
+	srv := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		hits.Add(1)
+		<-r.Context().Done()
+	}))
+	defer srv.Close()
+
+	client, err := syncthing.NewClient(srv.URL, "abc123", syncthing.ClientOptions{VerifyTLS: true})
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	svc := &Service{
+		Settings: Settings{},
+		Client:   client,
+		Logger:   log.New(io.Discard, "", 0),
+	}
+
+	folders := make([]string, 0, 3*syncthing.MaxConnsPerHost/2)
+	for i := 0; i < cap(folders); i++ {
+		folders = append(folders, fmt.Sprintf("folder%d", i))
+	}
+	if err := svc.checkSyncStatus(context.Background(), folders, 0); err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	if got := int(hits.Load()); got != len(folders) {
+		t.Fatalf("expected %d status requests, got %d", len(folders), got)
+	}
+}
+
+// Test startup scans for per-folder schedules are triggered concurrently
+func TestRunScansFolderCronConcurrentlyOnStartup(t *testing.T) {
+	defer func(d time.Duration) { scanTimeout = d }(scanTimeout)
+	scanTimeout = time.Second
+
+	// POSTs are only answered once all three are in flight at the same time,
+	// which sequential triggering can never reach.
+	const folders = 3
+	var inFlight atomic.Int32
+	allArrived := make(chan struct{})
+	srv := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		if r.Method != http.MethodPost {
+			_, _ = w.Write([]byte(`{}`))
+			return
+		}
+		defer inFlight.Add(-1)
+		if inFlight.Add(1) == folders {
+			close(allArrived)
+		}
+		select {
+		case <-allArrived:
+		case <-r.Context().Done():
+		}
+	}))
+	defer srv.Close()
+
+	client, err := syncthing.NewClient(srv.URL, "abc123", syncthing.ClientOptions{VerifyTLS: true})
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	svc := &Service{
+		Settings: Settings{
+			ScanOnStartup: true,
+			RunOnce:       true,
+			FolderCron: map[string]string{
+				"folderA": "*/5 * * * *",
+				"folderB": "0 0 * * *",
+				"folderC": "0 12 * * *",
+			},
+		},
+		Client: client,
+		Logger: log.New(io.Discard, "", 0),
+	}
+
+	if err := svc.Run(context.Background()); err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	select {
+	case <-allArrived:
+	default:
+		t.Fatalf("startup scans were not in flight concurrently")
+	}
+}
+
 func syncthingStub() *syncthing.Client {
 	// buildCronScheduler does not call the client; use a nil-ish placeholder.
 	return &syncthing.Client{}
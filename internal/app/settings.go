@@ -19,6 +19,7 @@ type Settings struct {
 	RunOnce        bool
 	DryRun         bool
 	CronExpr       string
+	Folders        []string // ST_FOLDERS for the global schedule; ["*"] means all
 	FolderCron     map[string]string
 	CronTimezone   string
 	StatusDelaySec float64
@@ -94,6 +95,7 @@ func LoadSettingsFromEnv() (Settings, error) {
 		RunOnce:        parseBool(getenv("RUN_ONCE", "false"), false),
 		DryRun:         parseBool(getenv("DRY_RUN", "false"), false),
 		CronExpr:       cronExpr,
+		Folders:        parseFolders(os.Getenv("ST_FOLDERS")),
 		FolderCron:     folderCron,
 		CronTimezone:   cronTZ,
 		StatusDelaySec: statusDelaySec,
@@ -109,7 +111,7 @@ func getenv(name, def string) string {
 }
 
 func parseBool(raw string, def bool) bool {
-	s := strings.TrimSpace(strings.ToLower(raw))
+	s := strings.ToLower(strings.TrimSpace(raw))
 	if s == "" {
 		return def
 	}
@@ -123,6 +125,24 @@ func parseBool(raw string, def bool) bool {
 	}
 }
 
+func parseFolders(raw string) []string {
+	if strings.TrimSpace(raw) == "" {
+		return []string{"*"}
+	}
+	parts := strings.Split(raw, ",")
+	out := make([]string, 0, len(parts))
+	for _, p := range parts {
+		p = strings.TrimSpace(p)
+		if p != "" {
+			out = append(out, p)
+		}
+	}
+	if len(out) == 0 {
+		return []string{"*"}
+	}
+	return out
+}
+
 func parseFolderCron(raw string) (map[string]string, error) {
 	out := map[string]string{}
 	for _, line := range strings.Split(raw, "\n") {
@@ -130,12 +150,12 @@ func parseFolderCron(raw string) (map[string]string, error) {
 		if line == "" || strings.HasPrefix(line, "#") {
 			continue
 		}
-		parts := strings.SplitN(line, ":", 2)
-		if len(parts) != 2 {
+		folder, expr, ok := strings.Cut(line, ":")
+		if !ok {
 			return nil, errors.New("Invalid ST_FOLDER_CRON line. Expected 'folderId: <cron expr>'")
 		}
-		folder := strings.TrimSpace(parts[0])
-		expr := strings.TrimSpace(parts[1])
+		folder = strings.TrimSpace(folder)
+		expr = strings.TrimSpace(expr)
 		if folder == "" || expr == "" {
 			return nil, errors.New("Invalid ST_FOLDER_CRON line. Expected 'folderId: <cron expr>'")
 		}
@@ -77,6 +77,26 @@ func TestLoadSettingsDefaults(t *testing.T) {
 	if st.StatusDelaySec != 5 {
 		t.Fatalf("status delay mismatch: %v", st.StatusDelaySec)
 	}
+	if len(st.Folders) != 2 || st.Folders[0] != "folder1" || st.Folders[1] != "folder2" {
+		t.Fatalf("folders mismatch: %q", st.Folders)
+	}
+}
+
+func TestLoadSettingsDefaultsFoldersToWildcard(t *testing.T) {
+	for _, raw := range []string{"", " , ,"} {
+		os.Clearenv()
+		os.Setenv("ST_API_KEY", "abc123")
+		os.Setenv("ST_CRON", "*/5 * * * *")
+		os.Setenv("ST_FOLDERS", raw)
+
+		st, err := LoadSettingsFromEnv()
+		if err != nil {
+			t.Fatalf("unexpected error: %v", err)
+		}
+		if len(st.Folders) != 1 || st.Folders[0] != "*" {
+			t.Fatalf("expected wildcard for ST_FOLDERS=%q, got %q", raw, st.Folders)
+		}
+	}
 }
 
 func TestLoadSettingsRejectsInvalidStatusDelay(t *testing.T) {
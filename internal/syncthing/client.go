@@ -11,13 +11,27 @@ import (
 	"net/url"
 	"path"
 	"strings"
+	"sync"
 	"time"
 )
 
+// MaxConnsPerHost is the client's connection pool size; callers that fan out
+// should keep at most this many requests in flight so none of them spend
+// their timeout queued inside the transport.
+const MaxConnsPerHost = 10
+
+const (
+	maxErrorBody = 2048     // bytes of an error response kept for diagnostics
+	maxDrainBody = 64 << 10 // beyond this, closing the connection is cheaper than draining
+)
+
 type Client struct {
-	baseURL *url.URL
-	apiKey  string
-	hc      *http.Client
+	scanURL   string
+	statusURL string
+	configURL string
+	scanURLs  sync.Map // folder ID -> scan URL with query
+	header    http.Header
+	hc        *http.Client
 }
 
 type ClientOptions struct {
@@ -34,7 +48,13 @@ func NewClient(apiURL, apiKey string, opts ClientOptions) (*Client, error) {
 		u.Path += "/"
 	}
 
+	// A single Client is shared for the lifetime of the service; size the idle
+	// pool so scans and status checks reuse keep-alive connections to Syncthing
+	// instead of redialing (DefaultTransport only keeps 2 idle conns per host).
 	tr := http.DefaultTransport.(*http.Transport).Clone()
+	tr.MaxIdleConns = MaxConnsPerHost
+	tr.MaxIdleConnsPerHost = MaxConnsPerHost
+	tr.MaxConnsPerHost = MaxConnsPerHost
 	if u.Scheme == "https" && !opts.VerifyTLS {
 		tr.TLSClientConfig = &tls.Config{InsecureSkipVerify: true} //nolint:gosec
 	}
@@ -44,36 +64,59 @@ func NewClient(apiURL, apiKey string, opts ClientOptions) (*Client, error) {
 		hc.Timeout = opts.RequestTimeout
 	}
 
-	return &Client{baseURL: u, apiKey: apiKey, hc: hc}, nil
+	header := http.Header{}
+	header.Set("X-API-Key", apiKey)
+	header.Set("Accept", "application/json")
+
+	return &Client{
+		scanURL:   endpointURL(u, "rest/db/scan"),
+		statusURL: endpointURL(u, "rest/db/status"),
+		configURL: endpointURL(u, "rest/system/config"),
+		header:    header,
+		hc:        hc,
+	}, nil
+}
+
+// endpointURL resolves an API path against the base URL once, so requests
+// only need to append a query string.
+func endpointURL(base *url.URL, p string) string {
+	u := *base
+	u.Path = path.Join(base.Path, p)
+	u.RawQuery = ""
+	return u.String()
+}
+
+func folderQuery(endpoint, folder string) string {
+	return endpoint + "?folder=" + url.QueryEscape(folder)
 }
 
-func (c *Client) doJSON(ctx context.Context, method, p string, q url.Values, timeout time.Duration, out any) (int, error) {
+func (c *Client) doJSON(ctx context.Context, method, rawURL string, timeout time.Duration, out any) (int, error) {
 	ctx, cancel := withTimeout(ctx, timeout)
 	defer cancel()
 
-	u := *c.baseURL
-	u.Path = path.Join(c.baseURL.Path, strings.TrimPrefix(p, "/"))
-	u.RawQuery = q.Encode()
-
-	req, err := http.NewRequestWithContext(ctx, method, u.String(), nil)
+	req, err := http.NewRequestWithContext(ctx, method, rawURL, nil)
 	if err != nil {
 		return 0, err
 	}
-	req.Header.Set("X-API-Key", c.apiKey)
-	req.Header.Set("Accept", "application/json")
+	// Shared across requests; net/http never mutates the request headers.
+	req.Header = c.header
 
 	resp, err := c.hc.Do(req)
 	if err != nil {
 		return 0, err
 	}
-	defer resp.Body.Close()
-
-	body, err := io.ReadAll(resp.Body)
-	if err != nil {
-		return resp.StatusCode, err
-	}
+	defer func() {
+		// Drain any unread bytes so the connection goes back to the idle pool.
+		_, _ = io.Copy(io.Discard, io.LimitReader(resp.Body, maxDrainBody))
+		resp.Body.Close()
+	}()
 
 	if resp.StatusCode >= 400 {
+		// Only a prefix is needed for the error message.
+		body, err := io.ReadAll(io.LimitReader(resp.Body, maxErrorBody))
+		if err != nil {
+			return resp.StatusCode, err
+		}
 		if len(body) == 0 {
 			return resp.StatusCode, errors.New("http error")
 		}
@@ -84,19 +127,32 @@ func (c *Client) doJSON(ctx context.Context, method, p string, q url.Values, tim
 		return resp.StatusCode, nil
 	}
 
-	if err := json.Unmarshal(body, out); err != nil {
+	// Decode straight from the body rather than buffering it first; the
+	// config payload can be large and is only needed once.
+	if err := json.NewDecoder(resp.Body).Decode(out); err != nil {
 		return resp.StatusCode, err
 	}
 	return resp.StatusCode, nil
 }
 
 func (c *Client) PostScan(ctx context.Context, folder string, timeout time.Duration) (int, error) {
-	q := url.Values{}
+	u := c.scanURL
 	if strings.TrimSpace(folder) != "" && folder != "*" {
-		q.Set("folder", folder)
+		u = c.folderScanURL(folder)
+	}
+	// The scan response carries nothing we use (and is usually empty), so skip decoding.
+	return c.doJSON(ctx, http.MethodPost, u, timeout, nil)
+}
+
+// folderScanURL memoizes scan URLs; the set of scanned folders is fixed by
+// configuration, so this never grows past it.
+func (c *Client) folderScanURL(folder string) string {
+	if u, ok := c.scanURLs.Load(folder); ok {
+		return u.(string)
 	}
-	var ignore any
-	return c.doJSON(ctx, http.MethodPost, "/rest/db/scan", q, timeout, &ignore)
+	u := folderQuery(c.scanURL, folder)
+	c.scanURLs.Store(folder, u)
+	return u
 }
 
 type FolderStatus struct {
@@ -106,10 +162,8 @@ type FolderStatus struct {
 }
 
 func (c *Client) FolderStatus(ctx context.Context, folder string, timeout time.Duration) (FolderStatus, int, error) {
-	q := url.Values{}
-	q.Set("folder", folder)
 	var st FolderStatus
-	code, err := c.doJSON(ctx, http.MethodGet, "/rest/db/status", q, timeout, &st)
+	code, err := c.doJSON(ctx, http.MethodGet, folderQuery(c.statusURL, folder), timeout, &st)
 	return st, code, err
 }
 
@@ -121,7 +175,7 @@ type Config struct {
 
 func (c *Client) SystemConfig(ctx context.Context, timeout time.Duration) (Config, int, error) {
 	var cfg Config
-	code, err := c.doJSON(ctx, http.MethodGet, "/rest/system/config", nil, timeout, &cfg)
+	code, err := c.doJSON(ctx, http.MethodGet, c.configURL, timeout, &cfg)
 	return cfg, code, err
 }
 
@@ -0,0 +1,87 @@
+package syncthing
+
+import (
+	"context"
+	"net/http"
+	"net/http/httptest"
+	"strings"
+	"testing"
+	"time"
+)
+
+func TestClientBuildsEndpointURLs(t *testing.T) {
+	var got []string
+	srv := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		if r.Header.Get("X-API-Key") != "abc123" {
+			t.Errorf("missing api key header on %s", r.URL)
+		}
+		got = append(got, r.Method+" "+r.URL.RequestURI())
+		if r.Method == http.MethodPost {
+			// Syncthing answers scan requests with an empty body.
+			return
+		}
+		w.Header().Set("Content-Type", "application/json")
+		_, _ = w.Write([]byte(`{}`))
+	}))
+	defer srv.Close()
+
+	c, err := NewClient(srv.URL+"/", "abc123", ClientOptions{VerifyTLS: true})
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+
+	ctx := context.Background()
+	if _, err := c.PostScan(ctx, "*", time.Second); err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	for i := 0; i < 2; i++ {
+		if _, err := c.PostScan(ctx, "folder A", time.Second); err != nil {
+			t.Fatalf("unexpected error: %v", err)
+		}
+	}
+	if _, _, err := c.FolderStatus(ctx, "folder&B", time.Second); err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	if _, _, err := c.SystemConfig(ctx, time.Second); err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+
+	want := []string{
+		"POST /rest/db/scan",
+		"POST /rest/db/scan?folder=folder+A",
+		"POST /rest/db/scan?folder=folder+A",
+		"GET /rest/db/status?folder=folder%26B",
+		"GET /rest/system/config",
+	}
+	if len(got) != len(want) {
+		t.Fatalf("expected %d requests, got %v", len(want), got)
+	}
+	for i := range want {
+		if got[i] != want[i] {
+			t.Fatalf("request %d mismatch: got %q, want %q", i, got[i], want[i])
+		}
+	}
+}
+
+func TestClientTruncatesErrorBody(t *testing.T) {
+	srv := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		http.Error(w, strings.Repeat("x", 10*maxErrorBody), http.StatusInternalServerError)
+	}))
+	defer srv.Close()
+
+	c, err := NewClient(srv.URL, "abc123", ClientOptions{VerifyTLS: true})
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+
+	_, code, err := c.FolderStatus(context.Background(), "folderA", time.Second)
+	if err == nil {
+		t.Fatalf("expected error")
+	}
+	if code != http.StatusInternalServerError {
+		t.Fatalf("status code mismatch: %d", code)
+	}
+	if n := len(err.Error()); n > maxErrorBody+len("http error: ") {
+		t.Fatalf("error message not truncated: %d bytes", n)
+	}
+}